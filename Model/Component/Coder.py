@@ -1,10 +1,11 @@
 from Model.Setting import EmbeddingSetting, TransformerSetting, DropoutSetting
 
+import torch
 from torch import Tensor
-from torch.nn import Module, TransformerEncoderLayer, TransformerEncoder, TransformerDecoderLayer
+from torch.nn import Module, ModuleList, TransformerEncoderLayer, TransformerEncoder, TransformerDecoderLayer
 
-from dataclasses import dataclass
-from typing import List, TypeVar
+from dataclasses import dataclass, fields, replace
+from typing import Callable, TypeVar
 
 L = TypeVar("L")
 def createCoderLayer(layer_t: L) -> L:
@@ -46,6 +47,32 @@ class CoderMask:
     TargetPadding: Tensor = None
     TargetAttention: Tensor = None
 
+    def apply(this, func: Callable[[Tensor], Tensor]) -> "CoderMask":
+        """
+        @brief Apply a function on every mask.
+
+        @param func The function to be applied, which takes a mask and returns a new mask.
+        @return A new set of masks; mask that is none remains none.
+        """
+        return replace(this, **{f.name : func(getattr(this, f.name))
+            for f in fields(this) if getattr(this, f.name) is not None})
+
+    def to(this, device: torch.device, non_blocking: bool = False) -> "CoderMask":
+        """
+        @brief Move all masks to a device.
+
+        @param device The destination device.
+        @param non_blocking Copy asynchronously with respect to the host, if the masks are in pinned memory.
+        @return A new set of masks on the destination device.
+        """
+        return this.apply(lambda m: m.to(device, non_blocking = non_blocking))
+
+    def pin_memory(this) -> "CoderMask":
+        """
+        @brief Copy all masks to pinned memory; this is called by the data loader when memory pinning is enabled.
+        """
+        return this.apply(lambda m: m.pin_memory())
+
 class Encoder(Module):
     """
     The encoder of the transformer.
@@ -76,7 +103,8 @@ class Decoder(Module):
     def __init__(this):
         super().__init__()
         # not using the built-in decoder because it doesn't allow using causal attention (for some reasons)
-        this.DecoderLayer: List[TransformerDecoderLayer] = [createCoderLayer(TransformerDecoderLayer) for _ in range(TransformerSetting.CODER_LAYER_COUNT)]
+        # layers must be registered as submodule, otherwise they are neither trained nor moved to device with the model
+        this.DecoderLayer: ModuleList = ModuleList([createCoderLayer(TransformerDecoderLayer) for _ in range(TransformerSetting.CODER_LAYER_COUNT)])
 
     def forward(this, dec_input: Tensor, enc_output: Tensor, mask: CoderMask) -> Tensor:
         """
@@ -3,7 +3,7 @@ from Data.MidiPianoRoll import MidiPianoRoll
 from Model.Setting import DiscriminatorSetting, DropoutSetting
 
 from torch import Tensor
-from torch.nn import Module, Flatten, Unflatten, Sequential, Linear, Conv2d, Conv1d, LSTM, LeakyReLU, BatchNorm1d, Sigmoid
+from torch.nn import Module, Flatten, Unflatten, Sequential, Linear, Conv2d, Conv1d, LSTM, LeakyReLU, BatchNorm1d
 
 from typing import List
 
@@ -62,15 +62,13 @@ class Discriminator(Module):
             batch_first = True, dropout = DropoutSetting.DISCRIMINATOR_SEQUENCE)
 
         this.Summarise: Sequential = Sequential(*roll2seq, seq2score)
-        this.SummaryProjection: Sequential = Sequential(
-            Linear(DiscriminatorSetting.SEQUENCE_HIDDEN, 1),
-            Sigmoid()
-        )
+        # output is unbounded logit, sigmoid is fused into the loss function for numerical stability
+        this.SummaryProjection: Linear = Linear(DiscriminatorSetting.SEQUENCE_HIDDEN, 1)
 
     def forward(this, x: Tensor) -> Tensor:
         """
         Input: (batch, time step, note)
-        Output: (batch); 1.0 is real, 0.0 is fake.
+        Output: (batch) in logit; after applying sigmoid, 1.0 is real, 0.0 is fake.
         """
         x = x.swapaxes(1, 2)[:, None, :, :] # (batch, feature, note, time step)
 
@@ -5,7 +5,7 @@ import torch
 from torch import Tensor
 import numpy as np
 
-from typing import Union
+from typing import Union, Tuple, Optional
 
 LengthData = Union[int, np.ndarray]
 
@@ -48,22 +48,39 @@ def makeNoPeekMask(extent: int) -> Tensor:
     # create triangular matrix
     return torch.triu(mask, out = mask, diagonal = 1)
 
-def makePadMask(time_window: np.ndarray) -> Tensor:
+def makePadMask(time_window: np.ndarray, extent: Optional[int] = None) -> Tensor:
     """
     @brief Create mask that ignores attention at certain position.
     This is used for padding due to use of mini-batch, such that padding are always at the end of each sequence.
 
     @param time_window Specifies an array of time window size for each batch.
-    @return A matrix of padding mask, with size (batch, L) where `L` is the longest sequence in the batch.
+    @param extent The length of the mask; if not specified, it is the longest sequence in the batch.
+    @return A matrix of padding mask, with size (batch, L) where `L` is the extent.
     This matrix can be sliced based on current sequence length.
     """
     batchSize: int = time_window.size
     # things now get a bit tricky, we need to fill padding index for full padded time window
     # if any time step does not make up a full time window, leave it as zero as we filled up initially
     sequence_pad_start: np.ndarray = calcSequenceLength(time_window)
-    max_sequence: int = np.max(sequence_pad_start)
+    max_sequence: int = np.max(sequence_pad_start) if extent is None else extent
 
     mask: Tensor = torch.zeros((batchSize, max_sequence), dtype = torch.bool)
     for b in range(batchSize):
         mask[b, sequence_pad_start[b]:] = True
-    return mask
\ No newline at end of file
+    return mask
+
+def shiftTarget(target: Tensor) -> Tuple[Tensor, Tensor]:
+    """
+    @brief Shift the target based on the transformer specification.
+    Masks for the shifted target input should be created with one time window less than the target.
+
+    @param target The target input.
+
+    @return The shifted target input and target expected output.
+    """
+    # for input, exclude the last time window
+    # for output, exclude the first one
+    windowSkip: int = calcTimeStepLength(1)
+
+    # make slices contiguous, so compiled model sees the same memory layout for every batch
+    return (target[:, :-windowSkip, :].contiguous(), target[:, windowSkip:, :].contiguous())
\ No newline at end of file
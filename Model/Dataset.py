@@ -7,8 +7,9 @@ from Data.MidiPianoRoll import MidiPianoRoll
 from pretty_midi import PrettyMIDI
 
 import torch
+import torch.distributed as dist
 from torch import Tensor
-from torch.utils.data import Dataset, DataLoader, random_split
+from torch.utils.data import Dataset, DataLoader, DistributedSampler, random_split
 from torch.nn.utils.rnn import pad_sequence
 
 import numpy as np
@@ -111,15 +112,33 @@ class BatchCollation:
     """
     
     def __init__(this):
-        pass
+        this.NoPeekMask: Tensor = torch.empty((0, 0), dtype = torch.bool)
+        """
+        No-peek mask for the longest target sequence seen so far, such that masks for shorter sequences are sliced from it.
+        """
+
+    def makeNoPeekMask(this, extent: int) -> Tensor:
+        """
+        @brief Get a no-peek mask, reusing the allocated mask whenever possible.
 
-    def __call__(this, batch: List[Tuple[Tensor, Tensor]]) -> Tuple[Tensor, Tensor, CoderMask]:
+        @param extent The length of extent of the square mask matrix.
+        @return The no-peek mask, copied from the allocated mask.
+        @see DataUtility.makeNoPeekMask()
+        """
+        if extent > this.NoPeekMask.size(0):
+            this.NoPeekMask = DataUtility.makeNoPeekMask(extent)
+        # make it contiguous, so compiled model sees the same memory layout regardless of the size of allocated mask,
+        # and only the mask in use is shared with the training process
+        return this.NoPeekMask[:extent, :extent].contiguous()
+
+    def __call__(this, batch: List[Tuple[Tensor, Tensor]]) -> Tuple[Tensor, Tensor, Tensor, CoderMask]:
         """
         @brief Collate a number of samples into a batch.
 
         @param batch Array of data sample of robotic and performance MIDI from dataset.
         Each sample should have shape of (time step, note).
-        @return Batched sample, with coder mask computed.
+        @return Batched sample of source, shifted target input and target expected output, with coder mask computed.
+        @see DataUtility.shiftTarget()
         """
         batchSize: int = len(batch)
         # first, we should pad the data sample of different time lengths
@@ -164,15 +183,16 @@ class BatchCollation:
         # include start and end token to the total time window count
         timeWindow += 2
 
-        # generate mask
-        targetSequence: int = DataUtility.calcSequenceLength(DataUtility.calcTimeWindowLength(data[1].size(1)))
+        # generate mask, target mask is sized for the shifted target input, which excludes the last time window
+        targetSequence: int = DataUtility.calcSequenceLength(DataUtility.calcTimeWindowLength(data[1].size(1)) - 1)
         # do not generate explicit masks if causal attention is intended to be used
         mask: CoderMask = CoderMask(
             SourcePadding = DataUtility.makePadMask(timeWindow[0]),
-            TargetPadding = DataUtility.makePadMask(timeWindow[1]),
-            TargetAttention = DataUtility.makeNoPeekMask(targetSequence)
+            TargetPadding = DataUtility.makePadMask(timeWindow[1], targetSequence),
+            TargetAttention = this.makeNoPeekMask(targetSequence)
         ) if not TransformerSetting.CAUSAL_ATTENTION_MASK else CoderMask()
-        return (*data, mask)
+        # shift target here so it is done in the background by the loader workers
+        return (data[0], *DataUtility.shiftTarget(data[1]), mask)
     
 def loadData(dataset: Dataset) -> Tuple[DataLoader, DataLoader, DataLoader]:
     """
@@ -180,12 +200,26 @@ def loadData(dataset: Dataset) -> Tuple[DataLoader, DataLoader, DataLoader]:
 
     @param dataset The dataset to be loaded.
     @return Data loaders for different purposes.
+    If the default process group has been initialised, each process only loads a distinct partition of the data.
     """
     # split the dataset randomly
     generator: torch.Generator = torch.Generator().manual_seed(DatasetSetting.DATA_SHUFFLE_SEED)
     split_data = random_split(dataset, DatasetSetting.DATA_SPLIT, generator)
 
+    # prepare batches in the background while the model is training, and pin them for asynchronous copy to GPU
+    worker: int = DatasetSetting.LOADER_WORKER
+    loaderOption: Dict = {
+        "collate_fn" : BatchCollation(),
+        "num_workers" : worker,
+        "pin_memory" : torch.cuda.is_available()
+    }
+    if worker > 0:
+        loaderOption.update(persistent_workers = True, prefetch_factor = DatasetSetting.LOADER_PREFETCH)
+
     def makeLoader(data: Dataset) -> DataLoader:
+        if dist.is_initialized():
+            return DataLoader(data, TrainingSetting.BATCH_SIZE,
+                sampler = DistributedSampler(data, seed = DatasetSetting.DATA_SHUFFLE_SEED), **loaderOption)
         loaderGen: torch.Generator = torch.Generator().set_state(generator.get_state())
-        return DataLoader(data, TrainingSetting.BATCH_SIZE, shuffle = True, collate_fn = BatchCollation(), generator = loaderGen)
+        return DataLoader(data, TrainingSetting.BATCH_SIZE, shuffle = True, generator = loaderGen, **loaderOption)
     return tuple((makeLoader(d) for d in split_data))
\ No newline at end of file
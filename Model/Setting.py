@@ -1,7 +1,7 @@
 from Data.MidiPianoRoll import MidiPianoRoll
 
 import os
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 
 PROJECT_ROOT: str = os.getcwd()
 TIME_WINDOW_ALLOCATION_INCREMENT: int = 100
@@ -48,6 +48,8 @@ class DropoutSetting:
 class DatasetSetting:
     DATA_SHUFFLE_SEED: int = 6666
     DATA_SPLIT: List[float] = [0.7, 0.2, 0.1]
+    LOADER_WORKER: int = 2
+    LOADER_PREFETCH: int = 4
 
     ASAP_PATH: str = "/home/stephen/shared-drives/V\\:/year4/cs407/dataset/asap-dataset-2021-09-16"
 
@@ -58,10 +60,14 @@ class DatasetSetting:
 class TrainingSetting:
     EPOCH: int = 500
     BATCH_SIZE: int = 4
+    ACCUMULATION_STEP: int = 1
 
     LR_GENERATOR: float = 5e-4
     LR_DISCRIMINATOR: float = 2e-4
     BETA_GENERATOR: Tuple[float, float] = (0.5, 0.98)
     BETA_DISCRIMINATOR: Tuple[float, float] = (0.5, 0.995)
 
+    MIXED_PRECISION: bool = True
+    COMPILE_MODE: Optional[str] = None
+
     LOG_FREQUENCY: int = 10
\ No newline at end of file
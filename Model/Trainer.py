@@ -1,21 +1,24 @@
-from Model.Component.Coder import CoderMask
 from Model.Component.Transformer import Transformer as Gen
 from Model.Component.Discriminator import Discriminator as Disc
 
 from Model.Setting import EmbeddingSetting, DatasetSetting, TrainingSetting
 
-from Model import DataUtility
-
 import torch
+import torch._dynamo
+import torch.distributed as dist
 from torch import Tensor
-from torch.nn import BCELoss
-from torch.utils.data import DataLoader
+from torch.nn import Module, BCEWithLogitsLoss
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import DataLoader, DistributedSampler
 from torch.utils.tensorboard.writer import SummaryWriter
 from torch.optim import Adam
+from torch.amp import GradScaler
 
 import datetime
+import threading
+from contextlib import nullcontext
 from enum import IntEnum
-from typing import Tuple
+from typing import Dict, Optional, ContextManager, Any
 
 import os
 
@@ -28,6 +31,20 @@ class Trainer():
     FAKE_LABEL: float = 0.0
     REAL_LABEL: float = 1.0
 
+    NOTE_SCALE: float = 2.0 / EmbeddingSetting.NOTE_ORIGINAL_FEATURE_SIZE
+    NOTE_BIAS: Tensor = torch.tensor(-1.0, dtype = torch.float32)
+    """
+    Note normalisation is `note * scale + bias`; bias is a scalar tensor such that the result is promoted to floating point.
+    """
+
+    # filename extension follows PyTorch's convention
+    GENERATOR_CHECKPOINT: str = "generator.pt"
+    DISCRIMINATOR_CHECKPOINT: str = "discriminator.pt"
+    OPTIMISER_CHECKPOINT: str = "optimiser.pt"
+    """
+    Optimiser, and all other training states.
+    """
+
     class OperationMode(IntEnum):
         """
         @brief The mode of operation.
@@ -38,14 +55,48 @@ class Trainer():
     def __init__(this, log_name: str):
         """
         @brief Create a trainer with untrained model with random initial state.
+        If the default process group has been initialised, for example when launched by `torchrun`,
+        the model is trained in data parallel with one process per GPU.
 
         @param log_name The directory name to store training stats for the current session.
         """
+        this.Distributed: bool = dist.is_initialized()
+        this.Rank: int = dist.get_rank() if this.Distributed else 0
+        """
+        Only the process of rank zero writes training stats and checkpoints.
+        """
+
         this.LogName: str = log_name
-        this.Summary: SummaryWriter = SummaryWriter(DatasetSetting.TRAIN_STATS_LOG_PATH + '/' + this.LogName)
+        # scalars are written in batch, and checkpoint flushes the writer anyway, so there is no need to flush frequently
+        this.Summary: Optional[SummaryWriter] = SummaryWriter(DatasetSetting.TRAIN_STATS_LOG_PATH + '/' + this.LogName,
+            max_queue = 4096, flush_secs = 300) if this.Rank == 0 else None
+
+        if this.Distributed:
+            this.Device: torch.device = torch.device("cuda", int(os.environ["LOCAL_RANK"]))
+            torch.cuda.set_device(this.Device)
+        else:
+            this.Device: torch.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        """
+        The device where the model is trained on.
+        """
 
-        this.Generator: Gen = Gen()
-        this.Discriminator: Disc = Disc()
+        # Neither whole-step CUDA graph capture nor per-module `make_graphed_callables()` is used,
+        # because the sequence length of each batch depends on the longest sample, such that no static input buffer can be allocated.
+        # In addition, graphed callables only accept tensor arguments, but the generator takes a coder mask.
+        # the models may be wrapped for data parallel, use `unwrapModel()` to access the underlying model
+        this.Generator: Module = Gen().to(this.Device)
+        this.Discriminator: Module = Disc().to(this.Device)
+        if this.Distributed:
+            # buffers such as batch norm statistics are kept local to each process
+            this.Generator = DistributedDataParallel(this.Generator, [this.Device], broadcast_buffers = False)
+            this.Discriminator = DistributedDataParallel(this.Discriminator, [this.Device], broadcast_buffers = False)
+        if TrainingSetting.COMPILE_MODE is not None:
+            # sequence length varies between batches, compile a static variant for each of a few distinct input shapes;
+            # dynamic shape is disabled because it fails to compile the generator
+            # beyond the limit (counting train and inference mode separately), dynamo silently falls back to eager execution
+            torch._dynamo.config.cache_size_limit = 16
+            this.Generator = torch.compile(this.Generator, mode = TrainingSetting.COMPILE_MODE, dynamic = False)
+            this.Discriminator = torch.compile(this.Discriminator, mode = TrainingSetting.COMPILE_MODE, dynamic = False)
 
         # FIXME: definitely should use dynamic learning rate
         this.GeneratorOptimiser: Adam = Adam(this.Generator.parameters(),
@@ -53,43 +104,82 @@ class Trainer():
         this.DiscriminatorOptimiser: Adam = Adam(this.Discriminator.parameters(),
             lr = TrainingSetting.LR_DISCRIMINATOR, betas = TrainingSetting.BETA_DISCRIMINATOR)
 
+        this.MixedPrecision: bool = TrainingSetting.MIXED_PRECISION and this.Device.type == "cuda"
+        """
+        Run forward pass in half precision; loss is always calculated in full precision.
+        """
+        # each optimiser has its own scaler, so an overflow in one model does not skip update of the other
+        this.GeneratorScaler: GradScaler = GradScaler("cuda", enabled = this.MixedPrecision)
+        this.DiscriminatorScaler: GradScaler = GradScaler("cuda", enabled = this.MixedPrecision)
+
         # parameters to be updated during training
         this.Epoch: int = 0
         this.GlobalStep: int = 0
         """
         The number of training step run in total, one training iteration is one global step; only updated during training.
         """
-        this.Criterion: BCELoss = BCELoss()
+        this.Criterion: BCEWithLogitsLoss = BCEWithLogitsLoss()
 
         # allocated memory
-        this.Label: Tensor = torch.zeros((TrainingSetting.BATCH_SIZE), dtype = torch.float32)
+        # only two label values are ever used, so fill them once and slice based on batch size
+        this.RealLabel: Tensor = torch.full((TrainingSetting.BATCH_SIZE, ), Trainer.REAL_LABEL, dtype = torch.float32, device = this.Device)
+        this.FakeLabel: Tensor = torch.full_like(this.RealLabel, Trainer.FAKE_LABEL)
+
+        this.Mode: Optional[Trainer.OperationMode] = None
+        """
+        The current operation mode of the model; none if it has never been set.
+        """
+        this.CheckpointWriter: Optional[threading.Thread] = None
+        """
+        The background thread writing the last checkpoint to file.
+        """
 
     def __del__(this):
-        this.Summary.close()
+        this.waitCheckpoint()
+        if this.Summary is not None:
+            this.Summary.close()
 
     @classmethod
     def loadFrom(cls, model_name: str):
         """
         @brief Load a trainer from a saved model.
 
-        @param model_name The name of the saved model.
+        @param model_name The name of the saved model, which is the directory of the checkpoint.
         """
-        # load saved data
-        model = torch.load(DatasetSetting.MODEL_OUTPUT_PATH + '/' + model_name)
+        # load saved data, memory mapped so tensors are only read when copied into the trainer
+        def load(filename: str) -> Dict[str, Any]:
+            return torch.load(DatasetSetting.MODEL_OUTPUT_PATH + '/' + model_name + '/' + filename, map_location = "cpu", mmap = True)
+        model: Dict[str, Any] = load(Trainer.OPTIMISER_CHECKPOINT)
         trainer: cls = cls(model["log_name"])
 
         # load each member data
-        trainer.Generator.load_state_dict(model["generator"])
-        trainer.Discriminator.load_state_dict(model["discriminator"])
+        Trainer.unwrapModel(trainer.Generator).load_state_dict(load(Trainer.GENERATOR_CHECKPOINT))
+        Trainer.unwrapModel(trainer.Discriminator).load_state_dict(load(Trainer.DISCRIMINATOR_CHECKPOINT))
 
         trainer.GeneratorOptimiser.load_state_dict(model["generator_optimiser"])
         trainer.DiscriminatorOptimiser.load_state_dict(model["discriminator_optimiser"])
+        # a disabled scaler saves an empty state, in which case the scaler starts fresh
+        if model["generator_scaler"]:
+            trainer.GeneratorScaler.load_state_dict(model["generator_scaler"])
+        if model["discriminator_scaler"]:
+            trainer.DiscriminatorScaler.load_state_dict(model["discriminator_scaler"])
 
         trainer.Epoch = model["epoch"]
         trainer.GlobalStep = model["global_step"]
         trainer.Criterion.load_state_dict(model["criterion"])
         return trainer
     
+    @staticmethod
+    def unwrapModel(model: Module) -> Module:
+        """
+        @brief Get the underlying model from compilation and parallel wrapper.
+
+        @param model The model, which may or may not be wrapped.
+        @return The model being wrapped, or the model itself if it is not wrapped.
+        """
+        model = getattr(model, "_orig_mod", model)
+        return model.module if isinstance(model, DistributedDataParallel) else model
+
     @staticmethod
     def normaliseNote(note: Tensor) -> Tensor:
         """
@@ -98,55 +188,80 @@ class Trainer():
         @param note Note in range [0, NoteFeatureSize]
         @return Note in range [-1.0, 1.0]
         """
-        return note.float() / EmbeddingSetting.NOTE_ORIGINAL_FEATURE_SIZE * 2.0 - 1.0
+        # type conversion, scaling and offset are done by a single kernel
+        return torch.add(Trainer.NOTE_BIAS, note, alpha = Trainer.NOTE_SCALE)
     
     @staticmethod
-    def shiftTarget(target: Tensor, mask_ref: CoderMask) -> Tuple[Tensor, Tensor]:
+    def copyToHost(state: Any) -> Any:
         """
-        @brief Shift the target based on the transformer specification, and modify the mask accordingly.
+        @brief Recursively copy all tensors in a state dictionary to host memory.
 
-        @param target The target input.
-        @param mask_ref The mask, which will be modified in-place based on the target input.
-
-        @return The shifted target input and target expected output.
+        @param state The state, which may be a tensor, or a collection of tensors.
+        @return A copy of the state, where all tensors are in host memory and do not share storage with the original ones.
+        The copy is asynchronous, so device should be synchronised before using the returned tensors.
         """
-        # for input, exclude the last time window
-        # for output, exclude the first one
-        windowSkip: int = DataUtility.calcTimeStepLength(1)
-        sequenceSkip: int = DataUtility.calcSequenceLength(1)
+        if isinstance(state, Tensor):
+            return state.detach().to("cpu", non_blocking = True, copy = True)
+        if isinstance(state, dict):
+            return {k : Trainer.copyToHost(v) for k, v in state.items()}
+        if isinstance(state, (list, tuple)):
+            return type(state)(Trainer.copyToHost(v) for v in state)
+        return state
 
-        mask_ref.TargetPadding = mask_ref.TargetPadding[:, :-sequenceSkip]
-        mask_ref.TargetAttention = mask_ref.TargetAttention[:-sequenceSkip, :-sequenceSkip]
-        return (target[:, :-windowSkip, :], target[:, windowSkip:, :])
-    
     def checkpoint(this, model_name: str) -> None:
         """
-        @brief Save the current state of the trainer to a file.
+        @brief Save the current state of the trainer to a directory.
+        The state is copied to host memory before returning, and is written to files in the background.
 
         @param module_name The name of the saving model.
         A datetime will be automatically appended to the end of the name.
+        This is a no-op except for the process of rank zero.
+        @see waitCheckpoint()
         """
-        checkpointPath: str = DatasetSetting.MODEL_OUTPUT_PATH
-        if not os.path.exists(checkpointPath):
-            os.makedirs(checkpointPath)
+        if this.Rank != 0:
+            return
+        # make sure only one checkpoint is being written at a time
+        this.waitCheckpoint()
 
         time: str = str(datetime.datetime.today().strftime("%Y-%m-%d_%H-%M-%S"))
+        checkpointPath: str = DatasetSetting.MODEL_OUTPUT_PATH + '/' + model_name + '-' + time
+        if not os.path.exists(checkpointPath):
+            os.makedirs(checkpointPath)
 
         this.Summary.flush()
-        torch.save({
-            "log_name" : this.LogName,
-
-            "generator" : this.Generator.state_dict(),
-            "discriminator" : this.Discriminator.state_dict(),
-
-            "generator_optimiser" : this.GeneratorOptimiser.state_dict(),
-            "discriminator_optimiser" : this.DiscriminatorOptimiser.state_dict(),
-
-            "epoch" : this.Epoch,
-            "global_step" : this.GlobalStep,
-            "criterion" : this.Criterion.state_dict()
-            # filename extension follows PyTorch's convention
-        }, checkpointPath + '/' + model_name + '-' + time + ".tar")
+        # training continues after returning, so take a snapshot of the current state
+        state: Dict[str, Dict[str, Any]] = Trainer.copyToHost({
+            Trainer.GENERATOR_CHECKPOINT : Trainer.unwrapModel(this.Generator).state_dict(),
+            Trainer.DISCRIMINATOR_CHECKPOINT : Trainer.unwrapModel(this.Discriminator).state_dict(),
+            Trainer.OPTIMISER_CHECKPOINT : {
+                "log_name" : this.LogName,
+
+                "generator_optimiser" : this.GeneratorOptimiser.state_dict(),
+                "discriminator_optimiser" : this.DiscriminatorOptimiser.state_dict(),
+                "generator_scaler" : this.GeneratorScaler.state_dict(),
+                "discriminator_scaler" : this.DiscriminatorScaler.state_dict(),
+
+                "epoch" : this.Epoch,
+                "global_step" : this.GlobalStep,
+                "criterion" : this.Criterion.state_dict()
+            }
+        })
+        if this.Device.type == "cuda":
+            torch.cuda.synchronize(this.Device)
+
+        def write() -> None:
+            for filename, s in state.items():
+                torch.save(s, checkpointPath + '/' + filename)
+        this.CheckpointWriter = threading.Thread(target = write)
+        this.CheckpointWriter.start()
+
+    def waitCheckpoint(this) -> None:
+        """
+        @brief Wait until the last checkpoint has been written to files.
+        """
+        if this.CheckpointWriter is not None:
+            this.CheckpointWriter.join()
+            this.CheckpointWriter = None
 
     def setMode(this, mode: OperationMode) -> None:
         """
@@ -154,13 +269,49 @@ class Trainer():
 
         @param mode The mode set to.
         """
-        match(mode):
-            case Trainer.OperationMode.INFERENCE:
-                this.Generator.eval()
-                this.Discriminator.eval()
-            case Trainer.OperationMode.TRAIN:
-                this.Generator.train()
-                this.Discriminator.train()
+        # setting mode on a model visits every submodule, skip if there is nothing to change
+        if mode == this.Mode:
+            return
+        training: bool = mode == Trainer.OperationMode.TRAIN
+        this.Generator.train(training)
+        this.Discriminator.train(training)
+        this.Mode = mode
+
+    def autocast(this) -> torch.autocast:
+        """
+        @brief Create a context within which forward pass is run in mixed precision, if enabled.
+        """
+        return torch.autocast(this.Device.type, torch.float16, this.MixedPrecision)
+
+    def log(this, tag: str, scalar: Dict[str, Tensor], average: bool = False) -> None:
+        """
+        @brief Write scalars at the current global step to the summary.
+        All values are transferred to host in one go.
+
+        @param tag The main tag of the scalars.
+        @param scalar Name to value of each scalar, each value should be a tensor with one element.
+        @param average True to average the scalars over all processes before writing.
+        If so, this function must be called by every process.
+        """
+        value: Tensor = torch.stack([s.detach().float().reshape(()) for s in scalar.values()])
+        if average and this.Distributed:
+            dist.all_reduce(value, dist.ReduceOp.AVG)
+        if this.Summary is None:
+            return
+
+        # unlike add_scalars(), this writes all scalars to the same event file, rather than creating one writer per scalar
+        for name, v in zip(scalar.keys(), value.tolist()):
+            this.Summary.add_scalar(tag + '/' + name, v, this.GlobalStep)
+
+    def gradientSync(this, model: Module, sync: bool) -> ContextManager:
+        """
+        @brief Create a context within which forward pass is run, that controls gradient synchronisation between processes.
+
+        @param model The model to be run.
+        @param sync True to synchronise gradient in the following backward pass.
+        Otherwise gradient is only accumulated locally, and will be synchronised in the next backward pass that does.
+        """
+        return model.no_sync() if this.Distributed and not sync else nullcontext()
 
     def advanceEpoch(this) -> None:
         """
@@ -172,63 +323,85 @@ class Trainer():
         """
         @brief Train the model for one epoch using a provided data loader.
         Note that it's application's responsibility to set the trainer to the correct mode.
+        Gradients are accumulated over a number of iterations before updating the parameters,
+        such that the effective batch size is the batch size of the data loader multiplied by the number of accumulation step.
 
         @param dataLoader The dataloader for which the model will be trained on.
+        It should collate samples with `BatchCollation`; to overlap data loading with training,
+        it should also use multiple workers with pinned memory.
         @see setMode()
+        @see loadData()
         """
+        if isinstance(dataLoader.sampler, DistributedSampler):
+            # make sure each epoch is shuffled differently
+            dataLoader.sampler.set_epoch(this.Epoch)
+
+        accumulation: int = TrainingSetting.ACCUMULATION_STEP
+        iteration: int = len(dataLoader)
         for i, data in enumerate(dataLoader):
-            fake, real, mask = data # source is robotic MIDI (fake), target is performance MIDI (real)
-            realInput, realExpected = Trainer.shiftTarget(real, mask)
+            # source is robotic MIDI (fake), target is performance MIDI (real), which has been shifted
+            fake, realInput, realExpected, mask = [d.to(this.Device, non_blocking = True) for d in data]
 
             batchSize: int = fake.size(0)
-            label: Tensor = this.Label[:batchSize].detach()
+            realLabel: Tensor = this.RealLabel[:batchSize]
+            fakeLabel: Tensor = this.FakeLabel[:batchSize]
+            # do not carry incomplete accumulation over to the next epoch
+            accumulationBegin: bool = i % accumulation == 0
+            accumulationEnd: bool = (i + 1) % accumulation == 0 or i + 1 == iteration
+
+            if accumulationBegin:
+                this.Discriminator.zero_grad(set_to_none = True)
+                this.Generator.zero_grad(set_to_none = True)
 
             # ---------------- train discriminator --------------- #
-            this.Discriminator.zero_grad()
             # train with all real batch
-            label.fill_(Trainer.REAL_LABEL)
             # normalised data for discriminator
-            score: Tensor = this.Discriminator(Trainer.normaliseNote(realExpected))
+            # real and fake batch gradients are summed up before being synchronised
+            with this.autocast(), this.gradientSync(this.Discriminator, False):
+                scoreReal: Tensor = this.Discriminator(Trainer.normaliseNote(realExpected))
             # calculate loss on all real batch
-            err_real: Tensor = this.Criterion(score, label)
-            # calculate gradient of discriminator in backward pass
-            err_real.backward()
-            Dx: float = score.mean().item()
+            err_real: Tensor = this.Criterion(scoreReal.float(), realLabel)
+            # calculate gradient of discriminator in backward pass, average over all accumulation steps
+            this.DiscriminatorScaler.scale(err_real / accumulation).backward()
 
             # train with all fake batch, basically just run the generator as usual
-            label.fill_(Trainer.FAKE_LABEL)
-            generated: Tensor = this.Generator(fake, realInput, mask)
-            # we consider everything from the generator is fake
-            score: Tensor = this.Discriminator(generated.detach()) # prevent updating parameters on generator
-            err_fake: Tensor = this.Criterion(score, label)
+            with this.autocast():
+                with this.gradientSync(this.Generator, accumulationEnd):
+                    generated: Tensor = this.Generator(fake, realInput, mask)
+                # we consider everything from the generator is fake
+                # the same score is used to train the generator, rather than running the discriminator again after it has been updated
+                with this.gradientSync(this.Discriminator, accumulationEnd):
+                    scoreFake: Tensor = this.Discriminator(generated)
+            err_fake: Tensor = this.Criterion(scoreFake.float(), fakeLabel)
             # calculate gradient of this batch, sum with previous gradients
-            err_fake.backward()
-            DGz1: float = score.mean().item()
+            # prevent updating parameters on generator, and keep the graph for training the generator
+            this.DiscriminatorScaler.scale(err_fake / accumulation).backward(
+                inputs = list(this.Discriminator.parameters()), retain_graph = True)
             # compute error of discriminator as a sum over real and fake batch
             err_discriminator: Tensor = err_real + err_fake
-            this.DiscriminatorOptimiser.step()
 
             # ----------------- train generator ------------------- #
-            this.Generator.zero_grad()
-            # invert the label for the generator cost
-            label.fill_(Trainer.REAL_LABEL)
-            # run another forward pass on discriminator because we just updated it
-            score: Tensor = this.Discriminator(generated)
             # calculate loss of generator
-            err_generator: Tensor = this.Criterion(score, label)
-            err_generator.backward()
-            DGz2: float = score.mean().item()
-            this.GeneratorOptimiser.step()
+            err_generator: Tensor = this.Criterion(scoreFake.float(), realLabel) # invert the label for the generator cost
+            # only compute gradient of generator, so it doesn't pollute the accumulated gradient of discriminator
+            this.GeneratorScaler.scale(err_generator / accumulation).backward(inputs = list(this.Generator.parameters()))
+
+            # generator gradient flows through parameters of discriminator, so only update after all backward passes
+            if accumulationEnd:
+                this.DiscriminatorScaler.step(this.DiscriminatorOptimiser)
+                this.DiscriminatorScaler.update()
+                this.GeneratorScaler.step(this.GeneratorOptimiser)
+                this.GeneratorScaler.update()
 
             # --------------------- logging ----------------------- #
             if i % TrainingSetting.LOG_FREQUENCY == 0:
-                this.Summary.add_scalars("train", {
-                    "Loss(D)" : err_discriminator.mean().item(),
-                    "Loss(G)" : err_generator.mean().item(),
-                    "D(x)" : Dx,
-                    "D(G(z1))" : DGz1,
-                    "D(G(z2))" : DGz2
-                }, this.GlobalStep)
+                this.log("train", {
+                    "Loss(D)" : err_discriminator,
+                    "Loss(G)" : err_generator,
+                    # discriminator outputs logit, convert to probability only when needed
+                    "D(x)" : torch.sigmoid(scoreReal).mean(),
+                    "D(G(z))" : torch.sigmoid(scoreFake).mean()
+                })
             this.GlobalStep += 1
 
     def validate(this, dataLoader: DataLoader) -> None:
@@ -238,32 +411,30 @@ class Trainer():
 
         @param dataLoader The data loader used for validation.
         """
-        with torch.no_grad():
+        with torch.inference_mode():
             for i, data in enumerate(dataLoader):
-                fake, real, mask = data
-                realInput, realExpected = Trainer.shiftTarget(real, mask)
+                fake, realInput, realExpected, mask = [d.to(this.Device, non_blocking = True) for d in data]
 
                 batchSize = fake.size(0)
-                label: Tensor = this.Label[:batchSize].detach()
+                realLabel: Tensor = this.RealLabel[:batchSize]
+                fakeLabel: Tensor = this.FakeLabel[:batchSize]
 
                 # --------------- validate discriminator -------------- #
-                label.fill_(Trainer.REAL_LABEL)
-                score: Tensor = this.Discriminator(Trainer.normaliseNote(realExpected))
-                err_discriminator: Tensor = this.Criterion(score, label)
-                Dx: float = score.mean().item()
+                with this.autocast():
+                    scoreReal: Tensor = this.Discriminator(Trainer.normaliseNote(realExpected))
+                err_discriminator: Tensor = this.Criterion(scoreReal.float(), realLabel)
 
                 # ---------------- validate generator ----------------- #
-                label.fill_(Trainer.FAKE_LABEL)
-                generated: Tensor = this.Generator(fake, realInput, mask)
-                score: Tensor = this.Discriminator(generated)
-                err_generator: Tensor = this.Criterion(score, label)
-                DGz: float = score.mean().item()
+                with this.autocast():
+                    generated: Tensor = this.Generator(fake, realInput, mask)
+                    scoreGenerated: Tensor = this.Discriminator(generated)
+                err_generator: Tensor = this.Criterion(scoreGenerated.float(), fakeLabel)
 
                 # --------------------- logging ----------------------- #
                 if i % TrainingSetting.LOG_FREQUENCY == 0:
-                    this.Summary.add_scalars("validation", {
+                    this.log("validation", {
                         "Loss(D)" : err_discriminator,
                         "Loss(G)" : err_generator,
-                        "D(x)" : Dx,
-                        "D(G(z))" : DGz
-                    }, this.GlobalStep)
\ No newline at end of file
+                        "D(x)" : torch.sigmoid(scoreReal).mean(),
+                        "D(G(z))" : torch.sigmoid(scoreGenerated).mean()
+                    }, True) # each process validates a different partition of the data
\ No newline at end of file
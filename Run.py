@@ -3,8 +3,16 @@ from Model.Trainer import Trainer
 
 from Model.Setting import TrainingSetting
 
+import torch.distributed as dist
+
+import os
+
 MODEL_NAME: str = "my-model"
 
+# launched by torchrun, train with one process per GPU
+if "LOCAL_RANK" in os.environ:
+    dist.init_process_group("nccl")
+
 print("Model training begin...", flush = True)
 
 train, validation, _ = loadData(ASAPDataset())
@@ -20,5 +28,8 @@ for epoch in range(TrainingSetting.EPOCH):
     model.advanceEpoch()
 
     model.checkpoint(MODEL_NAME + "-epoch_" + str(epoch))
-    
+
+model.waitCheckpoint()
+if dist.is_initialized():
+    dist.destroy_process_group()
 print("Model training end", flush = True)
\ No newline at end of file